@@ -7,81 +7,127 @@ subscription-level deployment stacks using the Azure CLI.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import copy
+import fnmatch
+import functools
+import heapq
+import io
 import json
 import os
 import shutil
-import subprocess
 import sys
-import threading
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-import yaml
+
+# PyYAML and orjson are imported on first use so that argument parsing (and
+# --help) does not pay for them.
+@functools.cache
+def _yaml_loader() -> Callable[[bytes], Any]:
+  try:
+    import yaml
+  except ImportError as exc:
+    raise ImportError(
+      "PyYAML is required to read manifests; install it with 'pip install -r requirements.txt'."
+    ) from exc
+
+  try:
+    from yaml import CSafeLoader as loader
+  except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as loader
+  return functools.partial(yaml.load, Loader=loader)
+
+
+@functools.cache
+def _json_loader() -> Callable[[bytes], Any]:
+  try:
+    from orjson import loads
+  except ImportError:  # orjson is an optional speed-up
+    from json import loads
+  return loads
+
+
+_MERGEABLE_TYPES = (dict, list)
 
 
 def _sequence_key(item: Any) -> Optional[str]:
-  if not isinstance(item, dict):
+  if item.__class__ is not dict:
     return None
   name = item.get("name")
-  if isinstance(name, str) and name:
+  if name.__class__ is str and name:
     return name
   stack_name = item.get("stackName")
-  if isinstance(stack_name, str) and stack_name:
+  if stack_name.__class__ is str and stack_name:
     return stack_name
   return None
 
 
 def _merge_sequences(base: List[Any], override: List[Any]) -> List[Any]:
   if not base:
-    return copy.deepcopy(override)
+    return list(override)
   if not override:
-    return copy.deepcopy(base)
+    return list(base)
 
-  if all(isinstance(item, dict) for item in base + override):
-    keys: List[str] = []
+  if all(item.__class__ is dict for item in base) and all(item.__class__ is dict for item in override):
     base_map: Dict[str, Any] = {}
     for item in base:
       key = _sequence_key(item)
       if key is None or key in base_map:
         # Fallback to overriding the full list when keys are not usable.
-        return copy.deepcopy(override)
-      keys.append(key)
-      base_map[key] = copy.deepcopy(item)
+        return list(override)
+      base_map[key] = item
 
-    append_order: List[str] = []
     for item in override:
       key = _sequence_key(item)
       if key is None:
-        return copy.deepcopy(override)
+        return list(override)
       if key in base_map:
         base_map[key] = _deep_merge(base_map[key], item)
       else:
-        base_map[key] = copy.deepcopy(item)
-        append_order.append(key)
+        base_map[key] = item
 
-    merged_keys = keys + append_order
-    return [base_map[key] for key in merged_keys]
+    return list(base_map.values())
 
-  return copy.deepcopy(override)
+  return list(override)
 
 
 def _deep_merge(base: Any, override: Any) -> Any:
-  if isinstance(base, dict) and isinstance(override, dict):
-    result = copy.deepcopy(base)
+  # The merged result shares untouched subtrees with its inputs; callers own
+  # freshly parsed data, so nothing needs to be copied here.
+  if base.__class__ is dict and override.__class__ is dict:
+    result = {**base}
     for key, value in override.items():
       if key in result:
-        result[key] = _deep_merge(result[key], value)
-      else:
-        result[key] = copy.deepcopy(value)
+        current = result[key]
+        if current.__class__ is value.__class__ and value.__class__ in _MERGEABLE_TYPES:
+          result[key] = _deep_merge(current, value)
+          continue
+      result[key] = value
     return result
-  if isinstance(base, list) and isinstance(override, list):
+  if base.__class__ is list and override.__class__ is list:
     return _merge_sequences(base, override)
-  return copy.deepcopy(override)
+  return override
+
+
+def _deep_merge_inplace(dest: Dict[str, Any], src: Dict[str, Any]) -> Dict[str, Any]:
+  # Same semantics as _deep_merge, but updates ``dest`` itself. Nested mappings
+  # may be YAML aliases shared with other keys, so they are merged into new dicts
+  # rather than mutated.
+  for key, value in src.items():
+    if key in dest:
+      current = dest[key]
+      if current.__class__ is dict and value.__class__ is dict:
+        dest[key] = _deep_merge(current, value)
+        continue
+      if current.__class__ is list and value.__class__ is list:
+        dest[key] = _merge_sequences(current, value)
+        continue
+    dest[key] = value
+  return dest
 
 
 @dataclass
@@ -95,6 +141,7 @@ class Dependency:
 class StackManifest:
   name: str
   manifest_path: Path
+  resolved_path: Path
   template_file: Path
   parameter_file: Optional[Path]
   subscription_deployment: bool = True
@@ -102,6 +149,7 @@ class StackManifest:
   location: Optional[str] = None
   description: Optional[str] = None
   dependencies: List[Dependency] = field(default_factory=list)
+  dependency_by_alias: Dict[str, Dependency] = field(default_factory=dict)
   exports: Dict[str, str] = field(default_factory=dict)
   extra_az_args: List[str] = field(default_factory=list)
   parameter_bindings: Dict[str, str] = field(default_factory=dict)
@@ -111,19 +159,93 @@ class StackManifest:
     return self.manifest_path.parent
 
 
+@dataclass(frozen=True)
+class AzDefaults:
+  """Run-wide Azure CLI settings shared by every stack command."""
+
+  az_cli: str
+  location: str
+  action_on_unmanage: str
+  deny_settings_mode: str
+  output_format: Optional[str] = None
+  command_prefix: Tuple[str, ...] = field(init=False)
+  management_flags: Tuple[str, ...] = field(init=False)
+
+  def __post_init__(self) -> None:
+    object.__setattr__(self, "command_prefix", (self.az_cli, "stack", "sub", "create"))
+    object.__setattr__(
+      self,
+      "management_flags",
+      ("--action-on-unmanage", self.action_on_unmanage, "--deny-settings-mode", self.deny_settings_mode),
+    )
+
+
 @dataclass
 class ExecutionGraph:
   order_index: Dict[str, int]
   dependents: Dict[str, Set[str]]
   indegree: Dict[str, int]
 
-  def initial_ready(self) -> List[str]:
-    return sorted(
-      [name for name, value in self.indegree.items() if value == 0],
-      key=lambda candidate: self.order_index[candidate],
-    )
+  def initial_ready(self) -> List[Tuple[int, str]]:
+    """Return a heap of (order index, name) entries for stacks without pending dependencies."""
+    ready = [(self.order_index[name], name) for name, value in self.indegree.items() if value == 0]
+    heapq.heapify(ready)
+    return ready
 
 
+@dataclass
+class OutputTagging:
+  """Per-run state for tagging the output of concurrently deployed stacks."""
+
+  label_color: str = ""
+  reset: str = ""
+  # Destination (see _destination_key) -> prefix of the stack whose line is left
+  # unterminated there.
+  open_lines: Dict[Any, Optional[bytes]] = field(default_factory=dict)
+
+  def tag(self, text_stream: Any, prefix: bytes, data: bytes) -> bytes:
+    """Prefix every line of ``data`` and record whether it leaves a line open."""
+    key = _destination_key(text_stream)
+    tagged = bytearray()
+    for line in data.splitlines(keepends=True):
+      owner = self.open_lines.get(key)
+      if owner != prefix:
+        if owner is not None:
+          tagged += b"\n"
+        tagged += prefix
+      tagged += line
+      self.open_lines[key] = None if line[-1:] in (b"\n", b"\r") else prefix
+    return bytes(tagged)
+
+  def close_line(self, text_stream: Any) -> None:
+    """Terminate a line a child left open on ``text_stream``'s destination, if any."""
+    key = _destination_key(text_stream)
+    if self.open_lines.get(key) is not None:
+      self.open_lines[key] = None
+      _write_bytes(text_stream, b"\n")
+
+  def print(self, *values: Any, file: Any = None) -> None:
+    """print() for the orchestrator's own messages, starting on a fresh line."""
+    file = file or sys.stdout
+    self.close_line(file)
+    print(*values, file=file)
+
+
+def _destination_key(text_stream: Any) -> Any:
+  # stdout and stderr usually share one terminal (or one file with 2>&1), so
+  # open-line state follows the underlying file rather than the stream object.
+  try:
+    status = os.fstat(text_stream.fileno())
+  except (AttributeError, OSError, ValueError):
+    return id(text_stream)
+  return (status.st_dev, status.st_ino)
+
+
+OUTPUT_FETCH_WORKERS = 8
+
+# Matches "--output=<fmt>", "-o" and "-o<fmt>"; a bare "--output" is checked separately.
+_OUTPUT_FLAG_PREFIXES = ("--output=", "-o")
+
 PALETTE_KEYS = ("heading", "root", "dependent", "arrow", "reset")
 
 
@@ -157,16 +279,36 @@ def build_console_palette(requested_mode: str) -> Dict[str, str]:
   return palette
 
 
+def _scan_manifest_files(root: Path, name_pattern: str) -> List[Path]:
+  """Recursively collect files whose name matches ``name_pattern`` using cached directory entries."""
+  matches: List[Path] = []
+  pending = [str(root)]
+  while pending:
+    directory = pending.pop()
+    try:
+      with os.scandir(directory) as entries:
+        for entry in entries:
+          if entry.is_dir(follow_symlinks=False):
+            pending.append(entry.path)
+          elif fnmatch.fnmatch(entry.name, name_pattern) and entry.is_file():
+            matches.append(Path(entry.path))
+    except OSError:
+      continue
+  matches.sort()
+  return matches
+
+
 class ManifestRepository:
   def __init__(self, root: Path, glob_pattern: str) -> None:
     self._root = root
     self._glob = glob_pattern
+    self._parsed_cache: Dict[Path, Dict[str, Any]] = {}
+    self._kind_cache: Dict[Path, str] = {}
+    self._resolved_paths: Dict[Path, Path] = {}
 
   def load(self) -> Dict[str, StackManifest]:
     manifests: Dict[str, StackManifest] = {}
-    for manifest_path in sorted(self._root.glob(self._glob)):
-      if not manifest_path.is_file():
-        continue
+    for manifest_path in self._discover_manifest_paths():
       manifest = self._parse_manifest(manifest_path)
       existing = manifests.get(manifest.name)
       if existing:
@@ -183,6 +325,18 @@ class ManifestRepository:
       raise ValueError(f"No manifest files found under '{self._root}' using pattern '{self._glob}'.")
     return manifests
 
+  def _resolve_path(self, path: Path) -> Path:
+    resolved = self._resolved_paths.get(path)
+    if resolved is None:
+      resolved = self._resolved_paths[path] = path.resolve()
+    return resolved
+
+  def _discover_manifest_paths(self) -> List[Path]:
+    name_pattern = self._glob[3:] if self._glob.startswith("**/") else ""
+    if name_pattern and "/" not in name_pattern and "\\" not in name_pattern:
+      return _scan_manifest_files(self._root, name_pattern)
+    return [path for path in sorted(self._root.glob(self._glob)) if path.is_file()]
+
   def _parse_manifest(self, manifest_path: Path) -> StackManifest:
     data = self._load_manifest_data(manifest_path)
 
@@ -205,10 +359,10 @@ class ManifestRepository:
     if not template_file:
       raise ValueError(f"Manifest {manifest_path}: stack.template.file is required.")
 
-    template_path = (manifest_path.parent / template_file).resolve()
+    template_path = self._resolve_path(manifest_path.parent / template_file)
     parameter_path = None
     if parameter_file:
-      parameter_path = (manifest_path.parent / parameter_file).resolve()
+      parameter_path = self._resolve_path(manifest_path.parent / parameter_file)
       if not parameter_path.exists():
         raise FileNotFoundError(
           f"Parameter file '{parameter_file}' referenced by {manifest_path} does not exist."
@@ -239,6 +393,7 @@ class ManifestRepository:
     return StackManifest(
       name=name,
       manifest_path=manifest_path,
+      resolved_path=self._resolve_path(manifest_path),
       template_file=template_path,
       parameter_file=parameter_path,
       subscription_deployment=subscription_deployment,
@@ -246,14 +401,15 @@ class ManifestRepository:
       location=location,
       description=description,
       dependencies=dependencies,
+      dependency_by_alias={dependency.name: dependency for dependency in dependencies},
       exports=exports,
       extra_az_args=list(extra_az_args_raw),
       parameter_bindings=parameter_bindings,
     )
 
   def _resolve_duplicate(self, existing: StackManifest, candidate: StackManifest) -> Optional[StackManifest]:
-    existing_kind = self._classify_manifest(existing.manifest_path)
-    candidate_kind = self._classify_manifest(candidate.manifest_path)
+    existing_kind = self._classify_manifest(existing.resolved_path)
+    candidate_kind = self._classify_manifest(candidate.resolved_path)
     if existing_kind == candidate_kind:
       return None
     if candidate_kind == "overlay":
@@ -262,12 +418,16 @@ class ManifestRepository:
       return existing
     return None
 
-  def _classify_manifest(self, manifest_path: Path) -> str:
-    try:
-      relative_parts = manifest_path.resolve().relative_to(self._root).parts
-    except ValueError:
-      relative_parts = manifest_path.resolve().parts
-    return "overlay" if "environments" in relative_parts else "base"
+  def _classify_manifest(self, resolved_path: Path) -> str:
+    kind = self._kind_cache.get(resolved_path)
+    if kind is None:
+      try:
+        relative_parts = resolved_path.relative_to(self._root).parts
+      except ValueError:
+        relative_parts = resolved_path.parts
+      kind = "overlay" if "environments" in relative_parts else "base"
+      self._kind_cache[resolved_path] = kind
+    return kind
 
   def _parse_dependency(self, row: dict, manifest_path: Path) -> Dependency:
     if not isinstance(row, dict):
@@ -285,13 +445,16 @@ class ManifestRepository:
     if seen is None:
       seen = set()
 
-    resolved_manifest_path = manifest_path.resolve()
+    resolved_manifest_path = self._resolve_path(manifest_path)
     if resolved_manifest_path in seen:
       raise ValueError(f"Cyclic 'extends' reference detected at {manifest_path}.")
+
+    cached = self._parsed_cache.get(resolved_manifest_path)
+    if cached is not None:
+      return copy.deepcopy(cached)
     seen.add(resolved_manifest_path)
 
-    with manifest_path.open("r", encoding="utf-8") as handle:
-      loaded = yaml.safe_load(handle) or {}
+    loaded = _yaml_loader()(manifest_path.read_bytes()) or {}
 
     if not isinstance(loaded, dict):
       raise ValueError(f"Manifest {manifest_path} must parse to a mapping.")
@@ -310,15 +473,16 @@ class ManifestRepository:
         )
 
       for entry in extends_list:
-        base_path = (manifest_path.parent / entry).resolve()
+        base_path = self._resolve_path(manifest_path.parent / entry)
         if not base_path.exists():
           raise FileNotFoundError(f"Manifest {manifest_path}: extended file '{entry}' was not found.")
         base_data = self._load_manifest_data(base_path, seen)
-        merged = _deep_merge(merged, base_data)
+        _deep_merge_inplace(merged, base_data)
 
-    merged = _deep_merge(merged, loaded)
+    _deep_merge_inplace(merged, loaded)
     self._ensure_absolute_template_paths(merged, manifest_path)
     seen.remove(resolved_manifest_path)
+    self._parsed_cache[resolved_manifest_path] = copy.deepcopy(merged)
     return merged
 
   def _ensure_absolute_template_paths(self, data: Dict[str, Any], manifest_path: Path) -> None:
@@ -328,13 +492,16 @@ class ManifestRepository:
     template_section = stack_section.get("template")
     if not isinstance(template_section, dict):
       return
+    # Copy before rewriting paths: either section may be a YAML alias shared elsewhere.
+    data["stack"] = stack_section = {**stack_section}
+    stack_section["template"] = template_section = {**template_section}
     parent_dir = manifest_path.parent
     for key in ("file", "parameters"):
       value = template_section.get(key)
       if isinstance(value, str) and value:
         candidate = Path(value)
         if not candidate.is_absolute():
-          absolute = (parent_dir / candidate).resolve()
+          absolute = self._resolve_path(parent_dir / candidate)
           template_section[key] = str(absolute)
         else:
           template_section[key] = str(candidate)
@@ -347,46 +514,41 @@ def resolve_execution_order(
   if target_stacks is None:
     target_stacks = set(manifests.keys())
 
-  needed: Set[str] = set()
   missing_dependencies: Dict[str, Set[str]] = defaultdict(set)
-
-  def collect(stack_name: str, requester: Optional[str]) -> None:
-    if stack_name in needed:
-      return
-    manifest = manifests.get(stack_name)
-    if manifest is None:
-      if requester is not None:
-        missing_dependencies[requester].add(stack_name)
-      else:
-        missing_dependencies.setdefault(stack_name, set())
-      return
-    needed.add(stack_name)
-    for dep in manifest.dependencies:
-      collect(dep.stack_name, manifest.name)
-
-  for stack in target_stacks:
-    collect(stack, stack)
+  for stack_name in target_stacks:
+    if stack_name not in manifests:
+      missing_dependencies[stack_name].add(stack_name)
 
   visited: Set[str] = set()
   visiting: Set[str] = set()
   order: List[StackManifest] = []
 
-  def visit(stack_name: str) -> None:
-    if stack_name in visited:
-      return
-    if stack_name in visiting:
-      raise ValueError(f"Cyclic dependency detected involving stack '{stack_name}'.")
-    visiting.add(stack_name)
-    manifest = manifests[stack_name]
-    for dep in manifest.dependencies:
-      if dep.stack_name in needed:
-        visit(dep.stack_name)
-    visiting.remove(stack_name)
-    visited.add(stack_name)
-    order.append(manifest)
-
-  for stack_name in needed:
-    visit(stack_name)
+  # Iterative post-order DFS: collects the reachable stacks and orders them in one sweep.
+  for root_name, root in manifests.items():
+    if root_name not in target_stacks or root_name in visited:
+      continue
+    visiting.add(root_name)
+    work: List[Tuple[StackManifest, Iterator[Dependency]]] = [(root, iter(root.dependencies))]
+    while work:
+      manifest, pending = work[-1]
+      for dep in pending:
+        dep_name = dep.stack_name
+        if dep_name in visited:
+          continue
+        if dep_name in visiting:
+          raise ValueError(f"Cyclic dependency detected involving stack '{dep_name}'.")
+        dep_manifest = manifests.get(dep_name)
+        if dep_manifest is None:
+          missing_dependencies[manifest.name].add(dep_name)
+          continue
+        visiting.add(dep_name)
+        work.append((dep_manifest, iter(dep_manifest.dependencies)))
+        break
+      else:
+        work.pop()
+        visiting.remove(manifest.name)
+        visited.add(manifest.name)
+        order.append(manifest)
 
   return order, missing_dependencies
 
@@ -416,12 +578,8 @@ def build_execution_graph(ordered_manifests: List[StackManifest]) -> ExecutionGr
 
 def build_az_command(
   manifest: StackManifest,
+  defaults: AzDefaults,
   *,
-  location: str,
-  action_on_unmanage: str,
-  deny_settings_mode: str,
-  output_format: str,
-  az_cli: str,
   extra_args: Iterable[str],
   parameter_overrides: Dict[str, Any],
   auto_approve: bool = False,
@@ -432,61 +590,61 @@ def build_az_command(
       f"Stack '{manifest.name}' declares a non-subscription deployment, which is not yet supported."
     )
 
-  template_path = str(manifest.template_file)
   command = [
-    az_cli,
-    "stack",
-    "sub",
-    "create",
+    *defaults.command_prefix,
     "--name",
     manifest.name,
     "--location",
-    manifest.location or location,
+    manifest.location or defaults.location,
     "--template-file",
-    template_path,
+    str(manifest.template_file),
   ]
 
   if manifest.parameter_file:
-    command.extend(["--parameters", str(manifest.parameter_file)])
+    command += ("--parameters", str(manifest.parameter_file))
 
   for param_name, value in parameter_overrides.items():
     serialized = json.dumps(value)
-    command.extend(["--parameters", f"{param_name}={serialized}"])
+    command += ("--parameters", f"{param_name}={serialized}")
 
-  command.extend([
-    "--action-on-unmanage",
-    action_on_unmanage,
-    "--deny-settings-mode",
-    deny_settings_mode,
-  ])
+  command += defaults.management_flags
 
-  if auto_approve and "--yes" not in extra_args and "--yes" not in command:
+  if auto_approve and "--yes" not in extra_args:
     command.append("--yes")
 
-  has_output_flag = any(
-    arg == "--output"
-    or arg.startswith("--output=")
-    or arg == "-o"
-    or (arg.startswith("-o") and len(arg) > 2)
-    for arg in extra_args
-  )
-  if output_format and not has_output_flag:
-    command.extend(["--output", output_format])
+  has_output_flag = any(arg == "--output" or arg.startswith(_OUTPUT_FLAG_PREFIXES) for arg in extra_args)
+  if defaults.output_format and not has_output_flag:
+    command += ("--output", defaults.output_format)
 
-  command.extend(extra_args)
+  command += extra_args
   return command
 
 
-def fetch_stack_outputs(az_cli: str, stack_name: str) -> Dict[str, Any]:
-  show_command = [az_cli, "stack", "sub", "show", "--name", stack_name, "--output", "json"]
-  completed = subprocess.run(show_command, check=False, capture_output=True, text=True)
-  if completed.returncode != 0:
-    return {}
+async def _run_az_json(command: List[str]) -> Any:
+  """Run an az query command and return its decoded JSON payload, or None on any failure."""
+  try:
+    process = await asyncio.create_subprocess_exec(
+      *command,
+      stdout=asyncio.subprocess.PIPE,
+      stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await process.communicate()
+  except OSError:
+    return None
+  if process.returncode != 0:
+    return None
   try:
-    payload = json.loads(completed.stdout)
-  except json.JSONDecodeError:
+    return _json_loader()(stdout)
+  except ValueError:  # JSON and Unicode decode errors from either loader
+    return None
+
+
+def _resolve_outputs(payload: Any) -> Dict[str, Any]:
+  if not isinstance(payload, dict):
     return {}
   outputs = payload.get("outputs", {}) or {}
+  if not isinstance(outputs, dict):
+    return {}
   resolved: Dict[str, Any] = {}
   for key, value in outputs.items():
     if isinstance(value, dict) and "value" in value:
@@ -496,37 +654,152 @@ def fetch_stack_outputs(az_cli: str, stack_name: str) -> Dict[str, Any]:
   return resolved
 
 
+async def fetch_stack_outputs(az_cli: str, stack_name: str) -> Dict[str, Any]:
+  show_command = [az_cli, "stack", "sub", "show", "--name", stack_name, "--output", "json"]
+  return _resolve_outputs(await _run_az_json(show_command))
+
+
+async def list_stack_outputs(az_cli: str) -> Dict[str, Dict[str, Any]]:
+  """Return the outputs of every stack in the current subscription using a single az call."""
+  payload = await _run_az_json([az_cli, "stack", "sub", "list", "--output", "json"])
+  if not isinstance(payload, list):
+    return {}
+  return {
+    entry["name"]: _resolve_outputs(entry)
+    for entry in payload
+    if isinstance(entry, dict) and isinstance(entry.get("name"), str)
+  }
+
+
+def bound_dependency_stacks(manifests: Iterable[StackManifest]) -> Set[str]:
+  """Return the dependency stack names whose outputs are consumed by parameter bindings."""
+  stack_names: Set[str] = set()
+  for manifest in manifests:
+    for binding in manifest.parameter_bindings.values():
+      if isinstance(binding, str) and "." in binding:
+        dependency = manifest.dependency_by_alias.get(binding.split(".", 1)[0])
+        if dependency is not None:
+          stack_names.add(dependency.stack_name)
+  return stack_names
+
+
+async def prefetch_stack_outputs(
+  az_cli: str,
+  stack_names: Iterable[str],
+  exports_cache: Dict[str, Dict[str, Any]],
+) -> None:
+  """Fetch outputs for several stacks concurrently and store the results in the cache.
+
+  Stacks returned by the list call are cached even without outputs; per-stack
+  show lookups are cached only when they return outputs.
+  """
+  pending = sorted(name for name in set(stack_names) if name not in exports_cache)
+  if not pending:
+    return
+  if len(pending) > 1:
+    # One list call replaces a process launch per stack. Stacks it did not return
+    # at all (or every stack, if the list call failed) fall back to show.
+    listed = await list_stack_outputs(az_cli)
+    for name in pending:
+      if name in listed:
+        exports_cache[name] = listed[name]
+    pending = [name for name in pending if name not in listed]
+    if not pending:
+      return
+  semaphore = asyncio.Semaphore(OUTPUT_FETCH_WORKERS)
+
+  async def fetch(name: str) -> Dict[str, Any]:
+    async with semaphore:
+      return await fetch_stack_outputs(az_cli, name)
+
+  fetched = await asyncio.gather(*(fetch(name) for name in pending))
+  for name, outputs in zip(pending, fetched):
+    if outputs:
+      exports_cache[name] = outputs
+
+
 def format_command(command: Iterable[str]) -> str:
   return " ".join(json.dumps(arg) for arg in command)
 
 
-def run_command(
+def _write_bytes(text_stream: Any, data: bytes) -> None:
+  binary = getattr(text_stream, "buffer", None)
+  if binary is None:
+    text_stream.write(data.decode(errors="replace"))
+    return
+  text_stream.flush()  # keep ordering with text already print()ed to the same stream
+  binary.write(data)
+  binary.flush()
+
+
+async def _forward_output(stream: Any, text_stream: Any, prefix: bytes, tagging: OutputTagging) -> None:
+  """Copy a child's output to text_stream chunk by chunk, prefixing every line."""
+  held_cr = b""
+  while True:
+    chunk = await stream.read(65536)
+    data = held_cr + chunk
+    held_cr = b""
+    if chunk and data.endswith(b"\r"):
+      # A "\r\n" split across two reads must stay a single line ending.
+      data, held_cr = data[:-1], b"\r"
+    if data:
+      # Partial lines (prompts, progress) are written immediately rather than held
+      # back; if another stack interleaves, its output starts on a fresh line.
+      _write_bytes(text_stream, tagging.tag(text_stream, prefix, data))
+    if not chunk:
+      return
+
+
+async def run_command(
   command: List[str],
   *,
   dry_run: bool,
   cwd: Path,
   verbose: bool,
   echo_commands: bool,
+  output_label: str = "",
+  tagging: Optional[OutputTagging] = None,
 ) -> int:
+  """Run a command, returning its exit code.
+
+  Output goes straight to the terminal; with tagging it is piped and each line is
+  prefixed with output_label instead, so concurrent stacks stay distinguishable.
+  """
+  emit = tagging.print if tagging is not None else print
   if dry_run:
     if verbose or echo_commands:
-      print(format_command(command))
+      emit(format_command(command))
     return 0
 
   if verbose or echo_commands:
-    print(format_command(command))
+    emit(format_command(command))
 
+  pipe = asyncio.subprocess.PIPE if tagging is not None else None
   try:
-    completed = subprocess.run(command, cwd=cwd, check=False)
+    process = await asyncio.create_subprocess_exec(
+      *command,
+      cwd=cwd,
+      stdout=pipe,
+      stderr=pipe,
+    )
   except FileNotFoundError as exc:
     missing = command[0]
-    print(
+    emit(
       f"Command '{missing}' could not be executed ({exc.strerror or 'file not found'}). "
       "Ensure it is installed and available on PATH.",
       file=sys.stderr,
     )
     return 127
-  return completed.returncode
+  if tagging is not None:
+    # Only stdout is coloured, matching the palette, which is chosen for stdout;
+    # the orchestrator's own stderr messages are plain as well.
+    stdout_prefix = f"{tagging.label_color}[{output_label}]{tagging.reset} ".encode()
+    stderr_prefix = f"[{output_label}] ".encode()
+    await asyncio.gather(
+      _forward_output(process.stdout, sys.stdout, stdout_prefix, tagging),
+      _forward_output(process.stderr, sys.stderr, stderr_prefix, tagging),
+    )
+  return await process.wait()
 
 
 def print_dependency_summary(
@@ -549,7 +822,13 @@ def print_dependency_summary(
 
   heading = palette.get("heading", "")
   reset = palette.get("reset", "")
-  print(f"{heading}Dependency map (selected scope):{reset}")
+  root_color = palette.get("root", "")
+  dependent_color = palette.get("dependent", "")
+  arrow_color = palette.get("arrow", "")
+
+  buffer = io.StringIO()
+  write = buffer.write
+  write(f"{heading}Dependency map (selected scope):{reset}\n")
   dependency_map: Dict[str, Dict[str, List[str]]] = {}
   for manifest in ordered:
     within_scope = [
@@ -574,58 +853,60 @@ def print_dependency_summary(
     if mapping["internal"] or mapping["external"]
   ]
 
-  print(f"  {palette.get('heading', '')}Root stacks:{reset}")
+  write(f"  {heading}Root stacks:{reset}\n")
   if roots:
     for name in sorted(roots, key=lambda candidate: execution_index[candidate]):
-      print(f"    - {palette.get('root', '')}{name}{reset}")
+      write(f"    - {root_color}{name}{reset}\n")
   else:
-    print("    (none)")
+    write("    (none)\n")
 
-  print(f"  {palette.get('heading', '')}Dependent stacks:{reset}")
+  write(f"  {heading}Dependent stacks:{reset}\n")
   if dependents:
     for name in sorted(dependents, key=lambda candidate: execution_index[candidate]):
-      print(f"    {palette.get('dependent', '')}{name}{reset}")
+      write(f"    {dependent_color}{name}{reset}\n")
       for dependency_name in dependency_map[name]["internal"]:
-        print(
-          f"      {palette.get('arrow', '')}-> {reset}{palette.get('root', '')}{dependency_name}{reset}"
-        )
+        write(f"      {arrow_color}-> {reset}{root_color}{dependency_name}{reset}\n")
       for dependency_name in dependency_map[name]["external"]:
-        print(
-          f"      {palette.get('arrow', '')}-> {reset}{palette.get('root', '')}{dependency_name}{reset}"
-          + f" {palette.get('arrow', '')}(external){reset}"
+        write(
+          f"      {arrow_color}-> {reset}{root_color}{dependency_name}{reset}"
+          f" {arrow_color}(external){reset}\n"
         )
   else:
-    print("    (none)")
+    write("    (none)\n")
 
-  print()
+  write("\n")
 
-  print(f"{heading}Execution order:{reset}")
+  write(f"{heading}Execution order:{reset}\n")
+  cwd = Path.cwd()
   for position, name in enumerate(execution_names, 1):
     manifest = all_manifests.get(name)
     origin = ""
     if manifest is not None:
       try:
-        origin = str(manifest.manifest_path.relative_to(Path.cwd()))
+        origin = str(manifest.manifest_path.relative_to(cwd))
       except ValueError:
         origin = str(manifest.manifest_path)
-    print(f"  {position}. {palette.get('dependent', '')}{name}{reset} ({origin})")
-  print()
+    write(f"  {position}. {dependent_color}{name}{reset} ({origin})\n")
+  write("\n")
+
+  sys.stdout.write(buffer.getvalue())
 
 
-def deploy_stack(
+async def deploy_stack(
   manifest: StackManifest,
   *,
   args: argparse.Namespace,
-  az_cli_path: str,
+  az_defaults: AzDefaults,
   exports_cache: Dict[str, Dict[str, Any]],
-  exports_lock: threading.Lock,
+  tagging: Optional[OutputTagging] = None,
 ) -> Tuple[bool, int]:
-  dependency_map = {dep.name: dep for dep in manifest.dependencies}
+  emit = tagging.print if tagging is not None else print
+  dependency_map = manifest.dependency_by_alias
   parameter_overrides: Dict[str, Any] = {}
 
   for param_name, binding in manifest.parameter_bindings.items():
     if not isinstance(binding, str) or "." not in binding:
-      print(
+      emit(
         f"Parameter binding '{binding}' for '{param_name}' in stack '{manifest.name}' is invalid.",
         file=sys.stderr,
       )
@@ -634,23 +915,21 @@ def deploy_stack(
     dep_alias, output_name = binding.split(".", 1)
     dependency = dependency_map.get(dep_alias)
     if dependency is None:
-      print(
+      emit(
         f"Stack '{manifest.name}' references unknown dependency alias '{dep_alias}' in parameter binding '{param_name}'.",
         file=sys.stderr,
       )
       continue
 
-    with exports_lock:
-      dep_outputs = exports_cache.get(dependency.stack_name)
-
+    # Deployments share the cache from a single event loop, so no lock is needed.
+    dep_outputs = exports_cache.get(dependency.stack_name)
     if dep_outputs is None:
-      dep_outputs = fetch_stack_outputs(az_cli_path, dependency.stack_name)
+      dep_outputs = await fetch_stack_outputs(az_defaults.az_cli, dependency.stack_name)
       if dep_outputs:
-        with exports_lock:
-          exports_cache[dependency.stack_name] = dep_outputs
+        dep_outputs = exports_cache.setdefault(dependency.stack_name, dep_outputs)
 
     if not dep_outputs or output_name not in dep_outputs:
-      print(
+      emit(
         f"Output '{output_name}' from dependency '{dependency.stack_name}' is unavailable; cannot bind parameter '{param_name}' for stack '{manifest.name}'.",
         file=sys.stderr,
       )
@@ -663,110 +942,132 @@ def deploy_stack(
   try:
     command = build_az_command(
       manifest,
-      location=args.location,
-      action_on_unmanage=args.action_on_unmanage,
-      deny_settings_mode=args.deny_settings_mode,
-      output_format=args.output,
-      az_cli=az_cli_path,
+      az_defaults,
       extra_args=combined_extra_args,
       parameter_overrides=parameter_overrides,
       auto_approve=args.yes,
     )
   except Exception as exc:  # pylint: disable=broad-except
-    print(f"Failed to build command for stack '{manifest.name}': {exc}", file=sys.stderr)
+    emit(f"Failed to build command for stack '{manifest.name}': {exc}", file=sys.stderr)
     return False, 1
 
   if args.dry_run:
     if args.verbose:
-      print(f"[dry-run] {manifest.name} from {manifest.manifest_path}")
+      emit(f"[dry-run] {manifest.name} from {manifest.manifest_path}")
       if not args.echo:
-        print(f"  command: {format_command(command)}")
+        emit(f"  command: {format_command(command)}")
   else:
-    print(f"Deploying stack '{manifest.name}' from {manifest.manifest_path}...")
-  return_code = run_command(
+    emit(f"Deploying stack '{manifest.name}' from {manifest.manifest_path}...")
+  return_code = await run_command(
     command,
     dry_run=args.dry_run,
     cwd=manifest.working_directory,
     verbose=args.verbose,
     echo_commands=args.echo,
+    output_label=manifest.name,
+    tagging=tagging,
   )
   if return_code != 0:
-    print(
+    emit(
       f"Stack '{manifest.name}' deployment failed with exit code {return_code}.",
       file=sys.stderr,
     )
     return False, return_code
 
-  if not args.dry_run:
-    with exports_lock:
-      cached_outputs = exports_cache.get(manifest.name)
-    if cached_outputs is None:
-      outputs = fetch_stack_outputs(az_cli_path, manifest.name)
-      if outputs:
-        with exports_lock:
-          exports_cache[manifest.name] = outputs
-
   return True, return_code
 
 
-def execute_stack_level(
-  level: List[str],
-  manifests: Dict[str, StackManifest],
+async def execute_stack(
+  manifest: StackManifest,
   *,
   args: argparse.Namespace,
-  az_cli_path: str,
+  az_defaults: AzDefaults,
   exports_cache: Dict[str, Dict[str, Any]],
-  exports_lock: threading.Lock,
-  executor: Optional[ThreadPoolExecutor],
-) -> Tuple[Dict[str, bool], List[str], bool]:
-  if not level:
-    return {}, [], False
-
-  results: Dict[str, bool] = {}
-  executed: List[str] = []
-  stop_due_to_error = False
-
-  if executor is not None:
-    future_map = {
-      executor.submit(
-        deploy_stack,
-        manifests[name],
-        args=args,
-        az_cli_path=az_cli_path,
-        exports_cache=exports_cache,
-        exports_lock=exports_lock,
-      ): name
-      for name in level
-    }
-
-    for future in as_completed(future_map):
-      name = future_map[future]
-      try:
-        success, _ = future.result()
-      except Exception as exc:  # pylint: disable=broad-except
-        print(f"Stack '{name}' raised an unexpected error: {exc}", file=sys.stderr)
-        success = False
-      results[name] = success
-      if not success and args.stop_on_error:
-        stop_due_to_error = True
-    executed = list(level)
-    return results, executed, stop_due_to_error
-
-  for name in level:
-    success, _ = deploy_stack(
-      manifests[name],
+  fetch_outputs: bool,
+  tagging: Optional[OutputTagging] = None,
+) -> bool:
+  try:
+    success, _ = await deploy_stack(
+      manifest,
       args=args,
-      az_cli_path=az_cli_path,
+      az_defaults=az_defaults,
       exports_cache=exports_cache,
-      exports_lock=exports_lock,
+      tagging=tagging,
     )
-    executed.append(name)
-    results[name] = success
-    if not success and args.stop_on_error:
-      stop_due_to_error = True
+    if success and fetch_outputs:
+      await prefetch_stack_outputs(az_defaults.az_cli, [manifest.name], exports_cache)
+  except Exception as exc:  # pylint: disable=broad-except
+    emit = tagging.print if tagging is not None else print
+    emit(f"Stack '{manifest.name}' raised an unexpected error: {exc}", file=sys.stderr)
+    return False
+  return success
+
+
+async def deploy_execution_graph(
+  graph: ExecutionGraph,
+  manifests: Dict[str, StackManifest],
+  ordered_manifests: List[StackManifest],
+  *,
+  args: argparse.Namespace,
+  az_defaults: AzDefaults,
+  palette: Optional[Dict[str, str]] = None,
+) -> Tuple[Set[str], Set[str]]:
+  """Deploy each stack as soon as its dependencies succeed; return the failed and never-started stack names."""
+  ready = graph.initial_ready()
+  remaining = set(graph.indegree.keys())
+  failures: Set[str] = set()
+  exports_cache: Dict[str, Dict[str, Any]] = {}
+  max_parallel = max(1, getattr(args, "parallelism", 1))
+  tagging: Optional[OutputTagging] = None
+  if max_parallel > 1:
+    palette = palette or {}
+    tagging = OutputTagging(palette.get("dependent", ""), palette.get("reset", ""))
+
+  # Outputs of stacks deployed in this run are fetched once they finish; everything
+  # else a binding needs already exists, so read it up-front in one concurrent batch.
+  bound_stacks = bound_dependency_stacks(ordered_manifests)
+  prefetch_names = bound_stacks if args.dry_run else bound_stacks - remaining
+  await prefetch_stack_outputs(az_defaults.az_cli, prefetch_names, exports_cache)
+
+  running: Dict[asyncio.Task, str] = {}
+  stop_requested = False
+  while ready or running:
+    # Fill free slots from the ready heap so a finished stack unblocks its dependents
+    # immediately instead of waiting for unrelated stacks of the same wave.
+    while ready and not stop_requested and len(running) < max_parallel:
+      name = heapq.heappop(ready)[1]
+      remaining.discard(name)
+      task = asyncio.create_task(
+        execute_stack(
+          manifests[name],
+          args=args,
+          az_defaults=az_defaults,
+          exports_cache=exports_cache,
+          fetch_outputs=not args.dry_run and name in bound_stacks,
+          tagging=tagging,
+        )
+      )
+      running[task] = name
+    if not running:
       break
 
-  return results, executed, stop_due_to_error
+    finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+    for task in finished:
+      name = running.pop(task)
+      if task.result():
+        for child in graph.dependents.get(name, set()):
+          graph.indegree[child] -= 1
+          if graph.indegree[child] == 0 and child in remaining:
+            heapq.heappush(ready, (graph.order_index[child], child))
+      else:
+        failures.add(name)
+        if args.stop_on_error:
+          stop_requested = True
+
+  if tagging is not None:
+    tagging.close_line(sys.stdout)
+    tagging.close_line(sys.stderr)
+  return failures, remaining
 
 
 def orchestrate(args: argparse.Namespace) -> int:
@@ -793,7 +1094,8 @@ def orchestrate(args: argparse.Namespace) -> int:
         file=sys.stderr,
       )
       return 1
-    missing = target_names - {manifest.name for manifest in execution_manifests}
+    execution_names = {manifest.name for manifest in execution_manifests}
+    missing = target_names - execution_names
     if missing:
       print(
         f"Requested stacks were not found in the manifest set: {', '.join(sorted(missing))}",
@@ -816,9 +1118,7 @@ def orchestrate(args: argparse.Namespace) -> int:
       )
     ordered_manifests = execution_manifests
     missing_dependencies = {
-      stack: deps
-      for stack, deps in missing_dependencies.items()
-      if stack in {manifest.name for manifest in ordered_manifests}
+      stack: deps for stack, deps in missing_dependencies.items() if stack in execution_names
     }
 
   print_dependency_summary(manifests, ordered_manifests, palette, missing_dependencies)
@@ -832,76 +1132,45 @@ def orchestrate(args: argparse.Namespace) -> int:
     )
     return 1
 
-  graph = build_execution_graph(ordered_manifests)
-  ready = graph.initial_ready()
-  remaining = set(graph.indegree.keys())
-
-  exports_cache: Dict[str, Dict[str, Any]] = {}
-  exports_lock = threading.Lock()
-  failures: Set[str] = set()
-  max_parallel = max(1, getattr(args, "parallelism", 1))
-  if getattr(args, "stop_on_error", False):
-    max_parallel = 1
-  executor: Optional[ThreadPoolExecutor] = None
-  stop_due_to_error = False
-
-  try:
-    if max_parallel > 1:
-      executor = ThreadPoolExecutor(max_workers=max_parallel)
-
-    while ready:
-      level = sorted(ready, key=lambda candidate: graph.order_index[candidate])
-      ready = []
-
-      results, executed_level, level_stop = execute_stack_level(
-        level,
-        manifests,
-        args=args,
-        az_cli_path=az_cli_path,
-        exports_cache=exports_cache,
-        exports_lock=exports_lock,
-        executor=executor,
-      )
+  az_defaults = AzDefaults(
+    az_cli=az_cli_path,
+    location=args.location,
+    action_on_unmanage=args.action_on_unmanage,
+    deny_settings_mode=args.deny_settings_mode,
+    output_format=args.output,
+  )
 
-      for name in executed_level:
-        remaining.discard(name)
-        success = results.get(name, False)
-        if success:
-          for child in graph.dependents.get(name, set()):
-            graph.indegree[child] -= 1
-            if graph.indegree[child] == 0 and child in remaining:
-              ready.append(child)
-        else:
-          failures.add(name)
+  graph = build_execution_graph(ordered_manifests)
+  failures, remaining = asyncio.run(
+    deploy_execution_graph(
+      graph, manifests, ordered_manifests, args=args, az_defaults=az_defaults, palette=palette
+    )
+  )
 
-      if level_stop:
-        stop_due_to_error = True
-      if stop_due_to_error:
-        break
+  if remaining:
+    blocked = sorted(remaining, key=lambda n: graph.order_index.get(n, float("inf")))
+    print(
+      f"Skipped stacks due to unmet dependencies or earlier failures: {', '.join(blocked)}",
+      file=sys.stderr,
+    )
+    failures.update(blocked)
 
-      ready = sorted(set(ready), key=lambda candidate: graph.order_index[candidate])
+  if failures:
+    ordered_failures = sorted(failures, key=lambda n: graph.order_index.get(n, float("inf")))
+    print(f"Completed with failures in: {', '.join(ordered_failures)}", file=sys.stderr)
+    return 1
 
-    if remaining:
-      blocked = sorted(remaining, key=lambda n: graph.order_index.get(n, float("inf")))
-      print(
-        f"Skipped stacks due to unmet dependencies or earlier failures: {', '.join(blocked)}",
-        file=sys.stderr,
-      )
-      failures.update(blocked)
+  print("All stacks processed successfully.")
+  return 0
 
-    if failures:
-      ordered_failures = sorted(failures, key=lambda n: graph.order_index.get(n, float("inf")))
-      print(f"Completed with failures in: {', '.join(ordered_failures)}", file=sys.stderr)
-      return 1
 
-    print("All stacks processed successfully.")
-    return 0
-  finally:
-    if executor is not None:
-      executor.shutdown(wait=True)
+# (--include-dependencies, --skip-dependencies) -> mode; the flags are mutually exclusive.
+_FLAG_DEPENDENCY_MODES = {(True, False): "include", (False, True): "skip"}
 
 
-def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+  # Built once per process so that repeated main(argv) calls reuse the parser.
   parser = argparse.ArgumentParser(description="Deployment stack orchestrator")
   parser.add_argument(
     "--root",
@@ -1008,18 +1277,21 @@ def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
       "Supports fast, targeted updates but should be used with caution."
     ),
   )
+  return parser
 
-  env_dependency_mode = os.environ.get("STACK_ORCHESTRATOR_DEPENDENCIES", "include").lower()
-  base_dependency_mode = env_dependency_mode if env_dependency_mode in {"include", "skip"} else "include"
 
-  args, remaining = parser.parse_known_args(argv)
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+  args, remaining = _build_parser().parse_known_args(argv)
   if remaining:
-    args.extra_az_args.extend(remaining)
-  dependency_mode = base_dependency_mode
-  if getattr(args, "include_dependencies", False):
-    dependency_mode = "include"
-  elif getattr(args, "skip_dependencies", False):
-    dependency_mode = "skip"
+    # Rebind rather than extend: the default list belongs to the cached parser.
+    args.extra_az_args = [*args.extra_az_args, *remaining]
+
+  # The environment only provides the default, so it is not consulted when a flag
+  # already decides the mode (or when --help/usage errors exit above).
+  dependency_mode = _FLAG_DEPENDENCY_MODES.get((args.include_dependencies, args.skip_dependencies))
+  if dependency_mode is None:
+    env_dependency_mode = os.environ.get("STACK_ORCHESTRATOR_DEPENDENCIES", "include").lower()
+    dependency_mode = env_dependency_mode if env_dependency_mode in {"include", "skip"} else "include"
   args.dependency_mode = dependency_mode
   return args
 